@@ -0,0 +1,470 @@
+"""
+Test-Level Run Analysis
+=======================
+
+Loads raw pytest-json-report output files produced by the experiment runners
+and computes per-test flakiness metrics across runs.
+
+Can be used as a library or run standalone:
+    python scripts/analysis/test_run_analyzer.py --results-dir comprehensive_results
+"""
+
+import re
+import json
+import mmap
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # headless backend; skips any GUI event-loop overhead
+import matplotlib.pyplot as plt
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _transitions_kernel(gid, seed, outcome_int, out_trans, out_pass, out_total):
+        """Count runs, passes, and outcome transitions per group in one pass
+
+        Adjacent rows only count as a transition within the same seed's run
+        stream; a seed boundary starts a fresh stream.
+        """
+        for i in range(gid.shape[0]):
+            g = gid[i]
+            out_total[g] += 1
+            if outcome_int[i] == 1:
+                out_pass[g] += 1
+            if (i > 0 and gid[i] == gid[i - 1] and seed[i] == seed[i - 1]
+                    and outcome_int[i] != outcome_int[i - 1]):
+                out_trans[g] += 1
+
+
+# Reports bigger than this are memory-mapped instead of read into a bytes copy
+_MMAP_THRESHOLD = 4 * 1024 * 1024
+
+
+def _load_json(json_file: Path) -> Dict:
+    """Decode a single JSON report, preferring orjson when available"""
+    if orjson is not None:
+        if json_file.stat().st_size > _MMAP_THRESHOLD:
+            with open(json_file, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # orjson rejects raw mmap objects; a memoryview keeps the
+                # zero-copy mapping while satisfying its input types
+                return orjson.loads(memoryview(mm))
+        return orjson.loads(json_file.read_bytes())
+    with open(json_file, 'r') as f:
+        return json.load(f)
+
+
+_TEST_COLUMNS = ('configuration', 'seed', 'run_number', 'test_name',
+                 'test_file', 'outcome', 'duration')
+
+
+def _new_test_columns() -> Dict[str, List]:
+    """Fresh empty column lists for the test-level frame"""
+    return {column: [] for column in _TEST_COLUMNS}
+
+
+# pytest-repeat nodeids end in "[step-count]" (merged with any parametrize
+# ids); split the step out so batched reports yield per-run rows and the
+# same test groups together across iterations
+_REPEAT_SUFFIX_RE = re.compile(r'\[(?:(?P<params>.+)-)?(?P<step>\d+)-\d+\]$')
+
+
+def _split_repeat(nodeid: str) -> Tuple[str, Optional[int]]:
+    """Return (nodeid without the repeat suffix, repeat step or None)"""
+    match = _REPEAT_SUFFIX_RE.search(nodeid)
+    if not match:
+        return nodeid, None
+    base = nodeid[:match.start()]
+    params = match.group('params')
+    if params:
+        base = f'{base}[{params}]'
+    return base, int(match.group('step'))
+
+
+def _stream_one(json_file: Path, config_name: str, run_number: int,
+                seed: int) -> Tuple[Dict, Dict[str, List]]:
+    """Stream-parse a report with ijson, emitting test rows as they are read"""
+    run_record = {
+        'configuration': config_name,
+        'seed': seed,
+        'run_number': run_number,
+        'duration': 0.0,
+        'tests_passed': 0,
+        'tests_total': 0,
+    }
+    columns = _new_test_columns()
+    nodeid = outcome = ''
+    duration = 0.0
+
+    with open(json_file, 'rb') as f:
+        for prefix, event, value in ijson.parse(f):
+            if prefix == 'tests.item':
+                if event == 'start_map':
+                    nodeid = outcome = ''
+                    duration = 0.0
+                elif event == 'end_map':
+                    base_id, step = _split_repeat(nodeid)
+                    columns['configuration'].append(config_name)
+                    columns['seed'].append(seed)
+                    columns['run_number'].append(step if step is not None else run_number)
+                    columns['test_name'].append(base_id)
+                    columns['test_file'].append(base_id.split('::')[0])
+                    columns['outcome'].append(outcome)
+                    columns['duration'].append(duration)
+            elif prefix == 'tests.item.nodeid':
+                nodeid = value
+            elif prefix == 'tests.item.outcome':
+                outcome = value
+            elif prefix == 'tests.item.call.duration':
+                duration = float(value)
+            elif prefix == 'duration':
+                run_record['duration'] = float(value)
+            elif prefix == 'summary.passed':
+                run_record['tests_passed'] = int(value)
+            elif prefix == 'summary.total':
+                run_record['tests_total'] = int(value)
+
+    return run_record, columns
+
+
+def _materialize_one(json_file: Path, config_name: str, run_number: int,
+                     seed: int) -> Tuple[Dict, Dict[str, List]]:
+    """Whole-document fallback when ijson is not installed"""
+    data = _load_json(json_file)
+
+    summary = data.get('summary', {})
+    run_record = {
+        'configuration': config_name,
+        'seed': seed,
+        'run_number': run_number,
+        'duration': data.get('duration', 0.0),
+        'tests_passed': summary.get('passed', 0),
+        'tests_total': summary.get('total', 0),
+    }
+
+    # Column lists instead of per-test dicts: pandas then assembles each
+    # column in one shot instead of inferring dtypes row by row
+    columns = _new_test_columns()
+    for test in data.get('tests', []):
+        base_id, step = _split_repeat(test.get('nodeid', ''))
+        columns['configuration'].append(config_name)
+        columns['seed'].append(seed)
+        columns['run_number'].append(step if step is not None else run_number)
+        columns['test_name'].append(base_id)
+        columns['test_file'].append(base_id.split('::')[0])
+        columns['outcome'].append(test.get('outcome', ''))
+        columns['duration'].append(test.get('call', {}).get('duration', 0.0))
+
+    return run_record, columns
+
+
+# Anchored suffix matches: robust against '_run_'/'_seed_' appearing inside
+# config names. Batch reports ('..._seed_N' and '..._runs') cover all runs of
+# a configuration in one file; their per-run split comes from the repeat
+# suffix on each nodeid instead of the filename.
+_RUN_RE = re.compile(r'_run_(\d+)$')
+_SEED_RE = re.compile(r'_seed_(\d+)$')
+
+
+def _load_one(json_file: Path) -> Tuple[Optional[Dict], Dict[str, List]]:
+    """Load a single result file into (run_record, test columns)"""
+    stem = json_file.stem
+    run_number = 0
+    seed = 0
+    match = _RUN_RE.search(stem)
+    if match:
+        run_number = int(match.group(1))
+        stem = stem[:match.start()]
+    elif stem.endswith('_runs'):
+        stem = stem[:-len('_runs')]
+    # The seed identifies an independent run stream of the configuration;
+    # it is kept as its own column so per-stream run ordering survives the
+    # stem normalization
+    match = _SEED_RE.search(stem)
+    if match:
+        seed = int(match.group(1))
+        stem = stem[:match.start()]
+    config_name = stem
+
+    try:
+        if ijson is not None:
+            return _stream_one(json_file, config_name, run_number, seed)
+        return _materialize_one(json_file, config_name, run_number, seed)
+    except Exception as e:
+        print(f"Warning: Failed to parse {json_file}: {e}")
+        return None, _new_test_columns()
+
+
+def load_experiment_data(results_dir: Path) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Load all JSON result files into run-level and test-level DataFrames"""
+    results_dir = Path(results_dir)
+    # The study's own aggregate exports (comprehensive_study_data.json and
+    # the opt-in .pretty variant) live next to the run reports; they are not
+    # pytest reports and would each yield a bogus zero-test run record
+    json_files = sorted(
+        path for path in results_dir.glob("*.json")
+        if not path.name.startswith("comprehensive_study_data"))
+    if not json_files:
+        return pd.DataFrame(), pd.DataFrame()
+
+    # Ingest is dominated by file I/O + JSON parsing and is embarrassingly
+    # parallel across the per-run report files
+    with ThreadPoolExecutor(max_workers=min(32, len(json_files))) as executor:
+        loaded = list(executor.map(_load_one, json_files))
+
+    run_records = [run for run, _ in loaded if run is not None]
+
+    columns = _new_test_columns()
+    for _, file_columns in loaded:
+        for name in _TEST_COLUMNS:
+            columns[name].extend(file_columns[name])
+
+    # Low-cardinality string columns become Categoricals so downstream
+    # groupby/mask work compares small integer codes, not Python strings
+    test_df = pd.DataFrame({
+        'configuration': pd.Categorical(columns['configuration']),
+        'seed': np.asarray(columns['seed'], dtype=np.int32),
+        'run_number': np.asarray(columns['run_number'], dtype=np.int32),
+        'test_name': columns['test_name'],
+        'test_file': pd.Categorical(columns['test_file']),
+        'outcome': pd.Categorical(columns['outcome']),
+        'duration': np.asarray(columns['duration'], dtype=np.float32),
+    })
+
+    run_df = pd.DataFrame.from_records(run_records)
+    if not run_df.empty:
+        run_df['configuration'] = run_df['configuration'].astype('category')
+
+    return run_df, test_df
+
+
+def analyze_flakiness(test_df: pd.DataFrame) -> pd.DataFrame:
+    """Compute per-(configuration, test) flakiness metrics across runs"""
+    if test_df.empty:
+        return pd.DataFrame()
+
+    # One stable global sort guarantees within-group run order everywhere
+    # below, so no per-group sorting is ever needed. Seed precedes
+    # run_number so each seed's batch forms one contiguous, ordered stream
+    test_df = test_df.sort_values(['configuration', 'test_name', 'seed', 'run_number'],
+                                  kind='mergesort', ignore_index=True)
+
+    cfg = test_df['configuration'].to_numpy()
+    name = test_df['test_name'].to_numpy()
+    seed = test_df['seed'].to_numpy()
+    outcome = test_df['outcome'].to_numpy()
+    duration = test_df['duration'].to_numpy(dtype=np.float64)
+
+    # Combined group id per (configuration, test) from the categorical codes:
+    # a vectorized multiply-add instead of factorizing Python tuples. The ids
+    # are nondecreasing because the frame is sorted on the same keys.
+    cfg_codes = test_df['configuration'].astype('category').cat.codes.to_numpy().astype(np.int64)
+    name_cat = test_df['test_name'].astype('category')
+    name_codes = name_cat.cat.codes.to_numpy().astype(np.int64)
+    n_names = len(name_cat.cat.categories)
+    gid = cfg_codes * n_names + name_codes
+    ngroups = int(gid[-1]) + 1
+
+    # Encode outcomes as small ints (passed=1, failed=0, other=2) so the
+    # per-row comparisons below run on integer arrays instead of strings
+    outcome_int = np.where(outcome == 'passed', 1,
+                           np.where(outcome == 'failed', 0, 2)).astype(np.int8)
+
+    dur_sum = np.bincount(gid, weights=duration, minlength=ngroups)
+
+    if numba is not None:
+        total_runs = np.zeros(ngroups, dtype=np.int64)
+        passes = np.zeros(ngroups, dtype=np.int64)
+        transitions = np.zeros(ngroups, dtype=np.int64)
+        _transitions_kernel(gid, seed, outcome_int, transitions, passes, total_runs)
+    else:
+        total_runs = np.bincount(gid, minlength=ngroups)
+        passes = np.bincount(gid, weights=(outcome_int == 1).astype(np.float64),
+                             minlength=ngroups).astype(np.int64)
+        # Outcome transitions (pass->fail or fail->pass between consecutive
+        # runs); rows from different seeds are independent streams, so a
+        # seed boundary never counts as a transition
+        trans_mask = ((outcome_int[1:] != outcome_int[:-1])
+                      & (gid[1:] == gid[:-1]) & (seed[1:] == seed[:-1]))
+        transitions = np.bincount(gid[1:][trans_mask], minlength=ngroups)
+
+    # Number of independent run streams per group: the instability
+    # denominator is the count of consecutive-run pairs, which excludes
+    # one pair per stream rather than one per group
+    stream_first = np.r_[True, (gid[1:] != gid[:-1]) | (seed[1:] != seed[:-1])]
+    streams = np.bincount(gid[stream_first], minlength=ngroups)
+
+    # (configuration, test) combinations that never occur leave empty slots
+    # in the bincount outputs; keep only the occupied ones, which line up
+    # with the group starts in row order
+    occupied = np.flatnonzero(total_runs > 0)
+    total_runs = total_runs[occupied]
+    passes = passes[occupied]
+    transitions = transitions[occupied]
+    streams = streams[occupied]
+    dur_sum = dur_sum[occupied]
+
+    first_idx = np.flatnonzero(np.r_[True, gid[1:] != gid[:-1]])
+    fails = total_runs - passes
+    safe_total = np.maximum(total_runs, 1)
+
+    # Counts fit comfortably in int32 and the rates in float32; the narrower
+    # dtypes halve the memory traffic of every downstream reduction
+    return pd.DataFrame({
+        'configuration': cfg[first_idx],
+        'test_name': name[first_idx],
+        'test_file': test_df['test_file'].to_numpy()[first_idx],
+        'total_runs': total_runs.astype(np.int32),
+        'passes': passes.astype(np.int32),
+        'fails': fails.astype(np.int32),
+        'avg_duration': (dur_sum / safe_total).astype(np.float32),
+        'transitions': transitions.astype(np.int32),
+        'pass_rate': (passes / safe_total).astype(np.float32),
+        'instability_index': (transitions / np.maximum(total_runs - streams, 1)).astype(np.float32),
+        'is_flaky': (passes > 0) & (fails > 0),
+    })
+
+
+def generate_summary_stats(flaky_df: pd.DataFrame, run_df: pd.DataFrame) -> Dict:
+    """Generate per-configuration summary statistics"""
+    if flaky_df.empty:
+        return {}
+
+    # One hashed groupby pass per frame instead of a full boolean-mask scan
+    # per configuration
+    stats = flaky_df.groupby('configuration', observed=True).agg(
+        total_tests=('test_name', 'size'),
+        flaky_tests=('is_flaky', 'sum'),
+        avg_pass_rate=('pass_rate', 'mean'),
+        avg_instability=('instability_index', 'mean'),
+    )
+    stats['flaky_tests'] = stats['flaky_tests'].astype(int)
+    stats['flaky_percentage'] = np.where(
+        stats['total_tests'] > 0,
+        stats['flaky_tests'] / stats['total_tests'] * 100, 0)
+
+    if not run_df.empty:
+        run_stats = run_df.groupby('configuration', observed=True).agg(
+            total_runs=('duration', 'size'),
+            avg_duration_per_run=('duration', 'mean'),
+        )
+        stats = stats.join(run_stats, how='left')
+        stats['total_runs'] = stats['total_runs'].fillna(0).astype(int)
+        stats['avg_duration_per_run'] = stats['avg_duration_per_run'].fillna(0.0)
+    else:
+        stats = stats.assign(total_runs=0, avg_duration_per_run=0.0)
+
+    return stats.to_dict(orient='index')
+
+
+def print_summary_report(flaky_df: pd.DataFrame, summary: Dict):
+    """Print a console summary of the flakiness analysis"""
+    print("📊 TEST-LEVEL FLAKINESS ANALYSIS")
+    print("=" * 50)
+
+    for config, stats in summary.items():
+        print(f"\n{config}:")
+        print(f"  • Tests analyzed: {stats['total_tests']}")
+        print(f"  • Flaky tests: {stats['flaky_tests']} ({stats['flaky_percentage']:.1f}%)")
+        print(f"  • Avg pass rate: {stats['avg_pass_rate']:.1%}")
+        print(f"  • Avg instability index: {stats['avg_instability']:.3f}")
+
+    if not flaky_df.empty:
+        flaky_only = flaky_df[flaky_df['is_flaky']]
+        k = min(5, len(flaky_only))
+        if k > 0:
+            # O(N) partial selection of the top-K instead of a full sort
+            instability = flaky_only['instability_index'].to_numpy()
+            top_idx = np.argpartition(-instability, k - 1)[:k]
+            top_unstable = flaky_only.iloc[top_idx].sort_values(
+                'instability_index', ascending=False)
+            print("\n🔥 Most unstable tests:")
+            for _, row in top_unstable.iterrows():
+                print(f"  • {row['test_name']} "
+                      f"(instability: {row['instability_index']:.3f}, pass rate: {row['pass_rate']:.1%})")
+
+
+def create_visualizations(flaky_df: pd.DataFrame, run_df: pd.DataFrame, output_dir: Path):
+    """Create per-test flakiness visualizations"""
+    if flaky_df.empty:
+        return
+
+    fig, axes = plt.subplots(1, 2, figsize=(15, 5))
+    fig.suptitle('Test-Level Flakiness Analysis', fontsize=16, fontweight='bold')
+
+    # Pass rate distribution
+    axes[0].hist(flaky_df['pass_rate'], bins=20, color='skyblue', alpha=0.7)
+    axes[0].set_title('Per-Test Pass Rate Distribution')
+    axes[0].set_xlabel('Pass Rate')
+    axes[0].set_ylabel('Number of Tests')
+
+    # Run duration by configuration: one groupby pass instead of a full
+    # boolean-mask scan per configuration
+    configs = []
+    duration_groups = []
+    for config, group in run_df.groupby('configuration', sort=False, observed=True):
+        configs.append(config)
+        duration_groups.append(group['duration'].to_numpy())
+    axes[1].boxplot(duration_groups)
+    axes[1].set_xticks(range(1, len(configs) + 1))
+    axes[1].set_xticklabels(configs)
+    axes[1].set_title('Run Duration by Configuration')
+    axes[1].set_ylabel('Duration (seconds)')
+    axes[1].tick_params(axis='x', rotation=45)
+
+    # One explicit layout pass; bbox_inches='tight' would force a second
+    # measuring draw, and 150 dpi rasterizes 4x fewer pixels than 300
+    fig.tight_layout()
+    fig.savefig(output_dir / 'test_level_flakiness.png', dpi=150)
+    plt.close(fig)
+
+
+def main():
+    """Run the test-level analysis standalone"""
+    parser = argparse.ArgumentParser(description="Analyze per-test flakiness from JSON result files")
+    parser.add_argument("--results-dir", type=str, default="comprehensive_results",
+                       help="Directory with pytest-json-report output files (default: comprehensive_results)")
+    parser.add_argument("--charts", action="store_true",
+                       help="Also generate visualization charts")
+    args = parser.parse_args()
+
+    results_dir = Path(args.results_dir)
+    run_df, test_df = load_experiment_data(results_dir)
+
+    if test_df.empty:
+        print(f"❌ No test-level data found in {results_dir}")
+        return 1
+
+    flaky_df = analyze_flakiness(test_df)
+    summary = generate_summary_stats(flaky_df, run_df)
+    print_summary_report(flaky_df, summary)
+
+    if args.charts:
+        create_visualizations(flaky_df, run_df, results_dir)
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
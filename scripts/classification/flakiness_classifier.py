@@ -5,117 +5,145 @@ Flakiness Classification Module
 Systematic classification and analysis of the 5 main types of flakiness.
 """
 
-from typing import Dict
-from config.study_config import FlakynessProfile
+from bisect import bisect_right
+from types import MappingProxyType
+from typing import Mapping
+import numpy as np
+from config.study_config import FlakynessProfile, FLAKINESS_TYPES, MITIGATION_STRATEGIES
+
+
+# Classification thresholds as sorted tuples; one binary search replaces the
+# chained comparisons when classifying per record
+_SEVERITY_THRESHOLDS = (0.1, 0.3, 0.6)
+_SEVERITY_LABELS = ("low", "moderate", "high", "severe")
+_PREDICTABILITY_THRESHOLDS = (0.1, 0.2, 0.3)
+_PREDICTABILITY_LABELS = ("highly_predictable", "moderately_predictable",
+                          "low_predictability", "unpredictable")
+
+
+# The profiles are constant for the program lifetime; build them once at
+# import and expose a read-only view instead of reallocating per call
+_FLAKINESS_PROFILES = MappingProxyType({
+    "randomness": FlakynessProfile(
+        test_type="randomness",
+        description="Tests dependent on random values or probabilistic outcomes",
+        failure_mechanism="Non-deterministic assertions based on random values",
+        typical_pass_rate=0.5,  # Highly variable
+        mitigation_effectiveness={
+            "retries": 0.3,      # Some improvement through multiple attempts
+            "mocking": 0.9,      # High - can mock random functions
+            "isolation": 0.1,    # Low - doesn't address root cause
+            "combined": 0.9      # High - mocking is key
+        }
+    ),
+    "timeout": FlakynessProfile(
+        test_type="timeout",
+        description="Tests sensitive to timing and performance variations",
+        failure_mechanism="Time-dependent assertions failing under load or slow systems",
+        typical_pass_rate=0.7,  # Often passes but fails under stress
+        mitigation_effectiveness={
+            "retries": 0.6,      # Moderate - second attempt may succeed
+            "mocking": 0.4,      # Low-Moderate - can mock slow operations
+            "isolation": 0.8,    # High - reduces resource contention
+            "combined": 0.8      # High - isolation + retries work well
+        }
+    ),
+    "order": FlakynessProfile(
+        test_type="order",
+        description="Tests dependent on execution order or global state",
+        failure_mechanism="Shared state between tests causing order dependencies",
+        typical_pass_rate=0.6,  # Depends on execution order
+        mitigation_effectiveness={
+            "retries": 0.2,      # Low - same order issues persist
+            "mocking": 0.5,      # Moderate - can mock shared resources
+            "isolation": 0.9,    # High - prevents state sharing
+            "combined": 0.9      # High - isolation is key
+        }
+    ),
+    "external": FlakynessProfile(
+        test_type="external",
+        description="Tests dependent on external systems (APIs, databases, network)",
+        failure_mechanism="Network failures, service unavailability, or slow responses",
+        typical_pass_rate=0.7,  # Often works but external failures occur
+        mitigation_effectiveness={
+            "retries": 0.7,      # High - external issues often temporary
+            "mocking": 0.95,     # Very High - eliminates external dependency
+            "isolation": 0.3,    # Low - doesn't address external issues
+            "combined": 0.95     # Very High - mocking is key
+        }
+    ),
+    "race": FlakynessProfile(
+        test_type="race",
+        description="Tests with race conditions and concurrency issues",
+        failure_mechanism="Thread synchronization issues and timing-dependent failures",
+        typical_pass_rate=0.8,  # Usually passes but occasionally fails
+        mitigation_effectiveness={
+            "retries": 0.4,      # Moderate - may succeed on retry
+            "mocking": 0.6,      # Moderate - can mock concurrent operations
+            "isolation": 0.9,    # High - eliminates concurrency issues
+            "combined": 0.9      # High - isolation prevents race conditions
+        }
+    )
+})
 
 
 class FlakynessClassifier:
     """Classifier for the 5 main types of flakiness"""
-    
+
     @staticmethod
-    def get_flakiness_profiles() -> Dict[str, FlakynessProfile]:
-        """Define the 5 main flakiness types and their characteristics"""
-        return {
-            "randomness": FlakynessProfile(
-                test_type="randomness",
-                description="Tests dependent on random values or probabilistic outcomes",
-                failure_mechanism="Non-deterministic assertions based on random values",
-                typical_pass_rate=0.5,  # Highly variable
-                mitigation_effectiveness={
-                    "retries": 0.3,      # Some improvement through multiple attempts
-                    "mocking": 0.9,      # High - can mock random functions
-                    "isolation": 0.1,    # Low - doesn't address root cause
-                    "combined": 0.9      # High - mocking is key
-                }
-            ),
-            "timeout": FlakynessProfile(
-                test_type="timeout",
-                description="Tests sensitive to timing and performance variations",
-                failure_mechanism="Time-dependent assertions failing under load or slow systems",
-                typical_pass_rate=0.7,  # Often passes but fails under stress
-                mitigation_effectiveness={
-                    "retries": 0.6,      # Moderate - second attempt may succeed
-                    "mocking": 0.4,      # Low-Moderate - can mock slow operations
-                    "isolation": 0.8,    # High - reduces resource contention
-                    "combined": 0.8      # High - isolation + retries work well
-                }
-            ),
-            "order": FlakynessProfile(
-                test_type="order",
-                description="Tests dependent on execution order or global state",
-                failure_mechanism="Shared state between tests causing order dependencies",
-                typical_pass_rate=0.6,  # Depends on execution order
-                mitigation_effectiveness={
-                    "retries": 0.2,      # Low - same order issues persist
-                    "mocking": 0.5,      # Moderate - can mock shared resources
-                    "isolation": 0.9,    # High - prevents state sharing
-                    "combined": 0.9      # High - isolation is key
-                }
-            ),
-            "external": FlakynessProfile(
-                test_type="external",
-                description="Tests dependent on external systems (APIs, databases, network)",
-                failure_mechanism="Network failures, service unavailability, or slow responses",
-                typical_pass_rate=0.7,  # Often works but external failures occur
-                mitigation_effectiveness={
-                    "retries": 0.7,      # High - external issues often temporary
-                    "mocking": 0.95,     # Very High - eliminates external dependency
-                    "isolation": 0.3,    # Low - doesn't address external issues
-                    "combined": 0.95     # Very High - mocking is key
-                }
-            ),
-            "race": FlakynessProfile(
-                test_type="race",
-                description="Tests with race conditions and concurrency issues",
-                failure_mechanism="Thread synchronization issues and timing-dependent failures",
-                typical_pass_rate=0.8,  # Usually passes but occasionally fails
-                mitigation_effectiveness={
-                    "retries": 0.4,      # Moderate - may succeed on retry
-                    "mocking": 0.6,      # Moderate - can mock concurrent operations
-                    "isolation": 0.9,    # High - eliminates concurrency issues
-                    "combined": 0.9      # High - isolation prevents race conditions
-                }
-            )
-        }
-    
+    def get_flakiness_profiles() -> Mapping[str, FlakynessProfile]:
+        """The 5 main flakiness types and their characteristics"""
+        return _FLAKINESS_PROFILES
+
     @staticmethod
     def classify_severity(flakiness_index: float) -> str:
         """Classify flakiness severity based on index"""
-        if flakiness_index < 0.1:
-            return "low"
-        elif flakiness_index < 0.3:
-            return "moderate"
-        elif flakiness_index < 0.6:
-            return "high"
-        else:
-            return "severe"
-    
+        return _SEVERITY_LABELS[bisect_right(_SEVERITY_THRESHOLDS, flakiness_index)]
+
     @staticmethod
     def classify_predictability(std_pass_rate: float) -> str:
         """Classify predictability based on standard deviation"""
-        if std_pass_rate < 0.1:
-            return "highly_predictable"
-        elif std_pass_rate < 0.2:
-            return "moderately_predictable"
-        elif std_pass_rate < 0.3:
-            return "low_predictability"
-        else:
-            return "unpredictable"
-    
+        return _PREDICTABILITY_LABELS[bisect_right(_PREDICTABILITY_THRESHOLDS, std_pass_rate)]
+
+    @staticmethod
+    def classify_severity_batch(flakiness_indices: np.ndarray) -> np.ndarray:
+        """Vectorized severity classification for an array of indices"""
+        bins = np.searchsorted(_SEVERITY_THRESHOLDS, flakiness_indices, side='right')
+        return np.asarray(_SEVERITY_LABELS)[bins]
+
+    @staticmethod
+    def classify_predictability_batch(std_pass_rates: np.ndarray) -> np.ndarray:
+        """Vectorized predictability classification for an array of stds"""
+        bins = np.searchsorted(_PREDICTABILITY_THRESHOLDS, std_pass_rates, side='right')
+        return np.asarray(_PREDICTABILITY_LABELS)[bins]
+
+
     @staticmethod
     def get_implementation_notes(flaky_type: str, strategy: str) -> str:
         """Get implementation notes for specific flakiness type and strategy"""
-        notes = {
-            ('randomness', 'mocking'): "Mock random number generators with fixed values",
-            ('randomness', 'retries'): "Multiple attempts may eventually succeed due to randomness",
-            ('timeout', 'isolation'): "Run tests in isolated processes to reduce resource contention",
-            ('timeout', 'retries'): "Retry failed tests as timing issues may be transient",
-            ('order', 'isolation'): "Essential for preventing state sharing between tests",
-            ('order', 'mocking'): "Mock shared resources to prevent state conflicts",
-            ('external', 'mocking'): "Mock all external API calls and services",
-            ('external', 'retries'): "Retry on network failures or service unavailability",
-            ('race', 'isolation'): "Run tests in separate processes to eliminate race conditions",
-            ('race', 'mocking'): "Mock concurrent operations to ensure deterministic behavior"
-        }
-        
-        return notes.get((flaky_type, strategy), f"Apply {strategy} strategy for {flaky_type} tests")
+        return _IMPLEMENTATION_NOTES.get(
+            (flaky_type, strategy), f"Apply {strategy} strategy for {flaky_type} tests")
+
+
+def _build_implementation_notes() -> MappingProxyType:
+    """Notes for every (type, strategy) pair, defaults filled in at import"""
+    notes = {
+        (flaky_type, strategy): f"Apply {strategy} strategy for {flaky_type} tests"
+        for flaky_type in FLAKINESS_TYPES for strategy in MITIGATION_STRATEGIES
+    }
+    notes.update({
+        ('randomness', 'mocking'): "Mock random number generators with fixed values",
+        ('randomness', 'retries'): "Multiple attempts may eventually succeed due to randomness",
+        ('timeout', 'isolation'): "Run tests in isolated processes to reduce resource contention",
+        ('timeout', 'retries'): "Retry failed tests as timing issues may be transient",
+        ('order', 'isolation'): "Essential for preventing state sharing between tests",
+        ('order', 'mocking'): "Mock shared resources to prevent state conflicts",
+        ('external', 'mocking'): "Mock all external API calls and services",
+        ('external', 'retries'): "Retry on network failures or service unavailability",
+        ('race', 'isolation'): "Run tests in separate processes to eliminate race conditions",
+        ('race', 'mocking'): "Mock concurrent operations to ensure deterministic behavior"
+    })
+    return MappingProxyType(notes)
+
+
+_IMPLEMENTATION_NOTES = _build_implementation_notes()
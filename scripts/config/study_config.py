@@ -6,27 +6,25 @@ Configuration classes and data structures for the comprehensive flaky test study
 """
 
 from dataclasses import dataclass
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Dict, Tuple
 from pathlib import Path
 
 
-@dataclass
+@dataclass(slots=True)
 class StudyConfiguration:
     """Configuration for the comprehensive study"""
     baseline_runs: int = 15
     mitigation_runs: int = 15
-    seeds: List[int] = None
+    seeds: Tuple[int, ...] = (42, 123, 999)
     output_dir: str = "comprehensive_results"
     verbose: bool = False
     skip_baseline: bool = False
     skip_mitigation: bool = False
-    
-    def __post_init__(self):
-        if self.seeds is None:
-            self.seeds = [42, 123, 999]
+    pretty_json: bool = False
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FlakynessProfile:
     """Profile of flakiness characteristics for a test type"""
     test_type: str
@@ -36,9 +34,9 @@ class FlakynessProfile:
     mitigation_effectiveness: Dict[str, float]
 
 
-# Study constants
-FLAKINESS_TYPES = ['randomness', 'timeout', 'order', 'external', 'race']
-MITIGATION_STRATEGIES = ['retries', 'mocking', 'isolation', 'combined']
+# Study constants (tuples: immutable and shareable)
+FLAKINESS_TYPES = ('randomness', 'timeout', 'order', 'external', 'race')
+MITIGATION_STRATEGIES = ('retries', 'mocking', 'isolation', 'combined')
 
 # Default baseline configurations for experiments
 BASELINE_CONFIGURATIONS = [
@@ -51,17 +49,18 @@ BASELINE_CONFIGURATIONS = [
     {"name": "all_flaky", "markers": "flaky", "description": "All flaky tests combined"},
 ]
 
-# Cost definitions for cost-benefit analysis (relative scale 1-10)
-IMPLEMENTATION_COSTS = {
+# Cost definitions for cost-benefit analysis (relative scale 1-10),
+# read-only so shared references can never be mutated or copied defensively
+IMPLEMENTATION_COSTS = MappingProxyType({
     'retries': 2,      # Easy to configure
     'mocking': 6,      # Requires understanding dependencies
     'isolation': 4,    # Moderate setup complexity
     'combined': 8      # Complex to implement properly
-}
+})
 
-MAINTENANCE_COSTS = {
+MAINTENANCE_COSTS = MappingProxyType({
     'retries': 1,      # Very low maintenance
     'mocking': 7,      # High - mocks need updating
     'isolation': 3,    # Low maintenance
     'combined': 9      # High maintenance complexity
-}
+})
@@ -8,6 +8,8 @@ Handles execution of baseline and mitigation experiments.
 import os
 import sys
 import time
+import asyncio
+import functools
 import subprocess
 import tempfile
 from pathlib import Path
@@ -16,18 +18,85 @@ import numpy as np
 
 from config.study_config import StudyConfiguration, BASELINE_CONFIGURATIONS
 from utils.helpers import (
-    set_random_seeds, check_mitigation_dependencies, 
-    parse_test_result, calculate_flakiness_index,
-    create_mock_conftest_content, validate_output_directory
+    check_baseline_dependencies, check_mitigation_dependencies,
+    parse_repeated_test_result, calculate_flakiness_index,
+    dump_result_line, create_mock_plugin_content, validate_output_directory
 )
+from utils.run_cache import RunCache
+
+
+# Immutable pytest argv prefix shared by every invocation; only the
+# per-run arguments get appended in the hot loops. Results come from the
+# JSON report, so the cache/stepwise plugins and the header are pure
+# per-spawn overhead
+# The tests never need BLAS/OpenMP pools, but NumPy in each pytest child
+# would still spin one up per worker; capping them to a single thread keeps
+# concurrent batches from oversubscribing the cores xdist already saturates
+_SINGLE_THREAD_ENV = {
+    'OMP_NUM_THREADS': '1',
+    'MKL_NUM_THREADS': '1',
+    'OPENBLAS_NUM_THREADS': '1',
+    'NUMEXPR_NUM_THREADS': '1',
+}
+
+
+_PYTEST_BASE = (
+    sys.executable, "-m", "pytest",
+    "--json-report",
+    "--json-report-omit=collectors,log,traceback,streams,warnings,keywords",
+    "-p", "no:cacheprovider",
+    "-p", "no:stepwise",
+    "--no-header",
+    "-q",
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _collect_test_ids(markers: str) -> tuple:
+    """Node ids matching a marker expression, collected once per process
+
+    Every pytest spawn otherwise re-walks and re-imports the tests tree and
+    re-applies the marker filter; passing the cached ids explicitly lets the
+    hundreds of re-invocations skip that. Returns an empty tuple when
+    collection fails so callers fall back to -m filtering.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-m", "pytest", "tests/", "--collect-only", "-q",
+         "-p", "no:cacheprovider", "-m", markers],
+        capture_output=True, text=True)
+    if proc.returncode != 0:
+        return ()
+    # -q prints ids relative to the resolved rootdir, which may drop the
+    # tests/ prefix the actual invocations (run from the repo root) need
+    return tuple(line if line.startswith('tests/') else f'tests/{line}'
+                 for line in proc.stdout.splitlines() if '::' in line)
+
+
+def _pytest_target(markers: str) -> tuple:
+    """Argv fragment selecting the tests for a marker expression"""
+    return _collect_test_ids(markers) or ("tests/", "-m", markers)
 
 
 class BaselineRunner:
     """Executes baseline experiments to establish flakiness patterns"""
-    
+
     def __init__(self, config: StudyConfiguration):
         self.config = config
         self.output_dir = validate_output_directory(Path(config.output_dir))
+        # Plain-string base path for hot-loop filename construction
+        self._out_str = str(self.output_dir)
+        # Snapshot the environment once instead of copying it per run
+        self._base_env = {**os.environ, **_SINGLE_THREAD_ENV}
+        # Disk cache so unchanged (markers, seed) batches skip pytest entirely
+        self._run_cache = RunCache(self.output_dir)
+        # Seed batches run concurrently, so divide the cores between them:
+        # each batch gets an explicit xdist width instead of -n auto, which
+        # would spawn a full core-count worker set per batch and
+        # oversubscribe the machine len(seeds)-fold (skewing the
+        # timing-sensitive tests the study measures)
+        cpu_count = os.cpu_count() or 1
+        self._batch_concurrency = max(1, min(len(config.seeds), cpu_count))
+        self._xdist_width = max(1, cpu_count // self._batch_concurrency)
     
     def run_experiments(self) -> Dict:
         """Execute baseline experiments for all flakiness types"""
@@ -41,88 +110,170 @@ class BaselineRunner:
         print(f"Runs per configuration: {self.config.baseline_runs}")
         print(f"Seeds: {self.config.seeds}")
         print()
-        
+
+        # The batched execution path leans on pytest-repeat/xdist/json-report;
+        # fail fast with an install hint instead of 7 configs of empty runs
+        if not check_baseline_dependencies():
+            print("❌ Missing required dependencies for baseline tests")
+            return {}
+
         baseline_data = {}
         
         for config in BASELINE_CONFIGURATIONS:
             print(f"🧪 Testing: {config['name']} - {config['description']}")
             
-            config_results = []
             config_start = time.time()
-            
-            for seed in self.config.seeds:
-                if self.config.verbose:
-                    print(f"   🌱 Seed: {seed}")
-                
-                for run in range(1, self.config.baseline_runs + 1):
-                    result = self._execute_test_run(
-                        markers=config['markers'],
-                        run_number=run,
-                        seed=seed,
-                        output_file=self.output_dir / f"baseline_{config['name']}_seed_{seed}_run_{run:03d}.json"
-                    )
-                    config_results.append(result)
-                    
-                    if not self.config.verbose and run % 10 == 0:
-                        avg_pass_rate = np.mean([r['pass_rate'] for r in config_results if r['pass_rate'] is not None])
-                        print(f"   Progress: seed {seed}, run {run}/{self.config.baseline_runs} (avg pass rate: {avg_pass_rate:.1%})")
-            
+
+            # One pytest-repeat batch per seed covers all baseline runs in a
+            # single interpreter start and collection phase
+            batch_specs = [
+                (config['markers'], seed,
+                 f"{self._out_str}/baseline_{config['name']}_seed_{seed}.json")
+                for seed in self.config.seeds
+            ]
+            total_runs = len(batch_specs) * self.config.baseline_runs
+
+            # Preallocated (pass_rate, execution_time) buffer filled as runs
+            # complete; invalid runs stay NaN and are skipped by the nan-aware
+            # reductions below
+            stats = np.full((total_runs, 2), np.nan)
+
+            # Stream each raw result dict straight to a JSONL log instead of
+            # holding every run's dict in memory for the whole phase; each
+            # line carries seed/run_number so consumers can reorder
+            results_file = f"{self._out_str}/baseline_{config['name']}_results.jsonl"
+
+            # Each seed batch is an independent pytest subprocess; launch them
+            # concurrently on the event loop so JSON parsing of finished
+            # batches overlaps with batches still executing
+            with open(results_file, 'wb') as results_log:
+                filled = asyncio.run(
+                    self._run_config_batches(batch_specs, results_log, stats, total_runs))
+
             config_duration = time.time() - config_start
-            
-            # Calculate statistics
-            valid_results = [r for r in config_results if r['pass_rate'] is not None]
-            
+
+            # Filter the NaN rows once and reduce over the compact slice
+            # instead of re-scanning for NaNs in every nan-aware reduction
+            valid_rates = stats[~np.isnan(stats[:, 0]), 0]
+            valid_runs = valid_rates.size
+
             baseline_data[config['name']] = {
                 'configuration': config,
-                'results': config_results,
+                'results_file': results_file,
                 'duration': config_duration,
-                'total_runs': len(config_results),
-                'valid_runs': len(valid_results),
-                'avg_pass_rate': np.mean([r['pass_rate'] for r in valid_results]) if valid_results else 0,
-                'std_pass_rate': np.std([r['pass_rate'] for r in valid_results]) if valid_results else 0,
-                'flakiness_index': calculate_flakiness_index(valid_results),
+                'total_runs': filled,
+                'valid_runs': valid_runs,
+                'avg_pass_rate': float(valid_rates.mean()) if valid_runs else 0,
+                'std_pass_rate': float(valid_rates.std()) if valid_runs else 0,
+                'flakiness_index': calculate_flakiness_index(valid_rates),
             }
             
             print(f"   ✅ Completed in {config_duration:.1f}s (avg pass rate: {baseline_data[config['name']]['avg_pass_rate']:.1%})")
             print()
         
         return baseline_data
-    
-    def _execute_test_run(self, markers: str, run_number: int, seed: int, output_file: Path) -> Dict:
-        """Execute a single baseline test run"""
-        # Set seed for this run
-        if markers == "randomness":
-            # For randomness tests, use run-specific seed to preserve flakiness
-            run_seed = (seed * 1000) + run_number
-            set_random_seeds(run_seed)
-        else:
-            set_random_seeds(seed)
-        
+
+    async def _run_config_batches(self, batch_specs, results_log, stats, total_runs: int) -> int:
+        """Run seed batches concurrently and stream results as batches finish"""
+        # Admit only as many batches as the core split allows; together with
+        # the per-batch xdist width this keeps total workers at roughly the
+        # core count
+        semaphore = asyncio.Semaphore(self._batch_concurrency)
+
+        async def bounded(markers, seed, output_file):
+            async with semaphore:
+                return await self._execute_seed_batch(markers, seed, output_file)
+
+        pass_rate_sum = 0.0
+        pass_rate_count = 0
+        filled = 0
+
+        for batch in asyncio.as_completed([bounded(*spec) for spec in batch_specs]):
+            for result in await batch:
+                results_log.write(dump_result_line(result))
+                if result['pass_rate'] is not None:
+                    pass_rate_sum += result['pass_rate']
+                    pass_rate_count += 1
+                    stats[filled] = (result['pass_rate'], result['execution_time'])
+                filled += 1
+
+            if not self.config.verbose:
+                avg_pass_rate = pass_rate_sum / pass_rate_count if pass_rate_count else 0.0
+                print(f"   Progress: {filled}/{total_runs} runs (avg pass rate: {avg_pass_rate:.1%})")
+
+        return filled
+
+    async def _execute_seed_batch(self, markers: str, seed: int, output_file: str) -> List[Dict]:
+        """Execute all baseline runs for one seed in a single pytest invocation"""
+        runs = self.config.baseline_runs
+
+        cache_key = self._run_cache.key(markers, seed, runs)
+        cached = self._run_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         cmd = [
-            sys.executable, "-m", "pytest",
-            "tests/",
-            "-m", markers,
-            "--json-report",
+            *_PYTEST_BASE,
+            *_pytest_target(markers),
+            "-n", str(self._xdist_width),
+            "--dist=loadfile",
+            "--count", str(runs),
             f"--json-report-file={output_file}",
-            "-q"
         ]
-        
-        env = os.environ.copy()
+
+        # Seeding in this parent process has no effect on the spawned pytest
+        # interpreter; pass the seed through the environment and let the
+        # autouse fixture in tests/conftest.py apply it inside the subprocess
+        env = {**self._base_env, 'PYTHONHASHSEED': str(seed), 'STUDY_SEED': str(seed)}
         start_time = time.time()
-        result = subprocess.run(cmd, capture_output=True, text=True, env=env)
+        # Console output is never read (results come from the JSON report),
+        # so route it to DEVNULL rather than buffering it through pipes
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL, env=env)
+        await proc.wait()
         execution_time = time.time() - start_time
-        
-        return parse_test_result(output_file, run_number, execution_time, 
-                               result.returncode, markers, seed)
+
+        # Decode the report in a worker thread so parsing overlaps with
+        # batches that are still executing
+        batch_results = await asyncio.to_thread(
+            parse_repeated_test_result, output_file, runs, execution_time,
+            proc.returncode, markers, seed)
+        # Only cache batches whose JSON report actually parsed: a crashed
+        # pytest or missing report leaves every pass_rate None, and caching
+        # that would pin valid_runs at 0 for all later studies until the
+        # test tree's fingerprint changes
+        if any(r['pass_rate'] is not None for r in batch_results):
+            self._run_cache.put(cache_key, batch_results)
+        return batch_results
 
 
 class MitigationRunner:
     """Executes mitigation strategy experiments"""
-    
+
+    # Strategy table: pytest args appended to _PYTEST_BASE and whether the
+    # mocking plugin must be loaded for the strategy's runs
+    _STRATEGIES = {
+        'retries': (("-n", "auto", "--dist=loadfile", "--reruns=3", "--reruns-delay=1"), False),
+        'mocking': (("-n", "auto", "--dist=loadfile"), True),
+        'isolation': (("-n", "auto", "--forked"), False),
+        'combined': (("-n", "auto", "--reruns=2", "--reruns-delay=0.5", "--forked"), True),
+    }
+
     def __init__(self, config: StudyConfiguration):
         self.config = config
         self.output_dir = validate_output_directory(Path(config.output_dir))
-    
+        # Plain-string base path for hot-loop filename construction
+        self._out_str = str(self.output_dir)
+        # The mock fixtures live in a static plugin module written once here
+        # and loaded with -p, so strategies never touch tests/conftest.py
+        mock_plugin = self.output_dir / "study_mock_plugin.py"
+        mock_plugin.write_text(create_mock_plugin_content())
+        self._base_env = {**os.environ, **_SINGLE_THREAD_ENV}
+        existing_path = self._base_env.get('PYTHONPATH')
+        self._base_env['PYTHONPATH'] = (
+            self._out_str if not existing_path
+            else self._out_str + os.pathsep + existing_path)
+
     def run_experiments(self) -> Dict:
         """Execute mitigation strategy experiments"""
         if self.config.skip_mitigation:
@@ -139,43 +290,43 @@ class MitigationRunner:
             print("❌ Missing required dependencies for mitigation tests")
             return {}
         
-        strategies = {
-            'retries': self._run_retry_strategy,
-            'mocking': self._run_mocking_strategy,
-            'isolation': self._run_isolation_strategy,
-            'combined': self._run_combined_strategy
-        }
-        
         mitigation_data = {}
-        
-        for strategy_name, strategy_func in strategies.items():
+
+        for strategy_name, (extra_args, use_mocks) in self._STRATEGIES.items():
             print(f"🔧 Testing strategy: {strategy_name.upper()}")
-            
+
             strategy_start = time.time()
-            strategy_results = []
-            
-            for run in range(1, self.config.mitigation_runs + 1):
-                result = strategy_func(run)
-                strategy_results.append(result)
-                
-                if not self.config.verbose and run % 5 == 0:
-                    avg_pass_rate = np.mean([r['pass_rate'] for r in strategy_results if r['pass_rate'] is not None])
-                    print(f"   Progress: run {run}/{self.config.mitigation_runs} (avg pass rate: {avg_pass_rate:.1%})")
-            
+            results_file = f"{self._out_str}/mitigation_{strategy_name}_results.jsonl"
+            stats = np.full((self.config.mitigation_runs, 2), np.nan)
+
+            # All runs of the strategy execute inside one pytest session via
+            # pytest-repeat, so the interpreter/collection cost is paid once
+            batch_results = self._run_strategy_batch(strategy_name, extra_args, use_mocks)
+
+            # Stream each raw result dict straight to a JSONL log instead
+            # of accumulating the dicts for the whole strategy
+            with open(results_file, 'wb') as results_log:
+                for result in batch_results:
+                    results_log.write(dump_result_line(result))
+                    if result['pass_rate'] is not None:
+                        stats[result['run_number'] - 1] = (result['pass_rate'], result['execution_time'])
+
             strategy_duration = time.time() - strategy_start
             
-            # Calculate statistics
-            valid_results = [r for r in strategy_results if r['pass_rate'] is not None]
-            
+            # Filter the NaN rows once and reduce over the compact slice
+            # instead of re-scanning for NaNs in every nan-aware reduction
+            valid_stats = stats[~np.isnan(stats[:, 0])]
+            valid_runs = len(valid_stats)
+
             mitigation_data[strategy_name] = {
                 'strategy': strategy_name,
-                'results': strategy_results,
+                'results_file': results_file,
                 'duration': strategy_duration,
-                'total_runs': len(strategy_results),
-                'valid_runs': len(valid_results),
-                'avg_pass_rate': np.mean([r['pass_rate'] for r in valid_results]) if valid_results else 0,
-                'std_pass_rate': np.std([r['pass_rate'] for r in valid_results]) if valid_results else 0,
-                'avg_execution_time': np.mean([r['execution_time'] for r in valid_results]) if valid_results else 0,
+                'total_runs': self.config.mitigation_runs,
+                'valid_runs': valid_runs,
+                'avg_pass_rate': float(valid_stats[:, 0].mean()) if valid_runs else 0,
+                'std_pass_rate': float(valid_stats[:, 0].std()) if valid_runs else 0,
+                'avg_execution_time': float(valid_stats[:, 1].mean()) if valid_runs else 0,
             }
             
             print(f"   ✅ Completed in {strategy_duration:.1f}s (avg pass rate: {mitigation_data[strategy_name]['avg_pass_rate']:.1%})")
@@ -183,109 +334,27 @@ class MitigationRunner:
         
         return mitigation_data
     
-    def _run_retry_strategy(self, run_number: int) -> Dict:
-        """Execute retry mitigation strategy"""
-        output_file = self.output_dir / f"mitigation_retries_run_{run_number:03d}.json"
-        
-        cmd = [
-            sys.executable, "-m", "pytest",
-            "tests/",
-            "-m", "flaky",
-            "--reruns=3",
-            "--reruns-delay=1",
-            "--json-report",
-            f"--json-report-file={output_file}",
-            "-q"
-        ]
-        
-        start_time = time.time()
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        execution_time = time.time() - start_time
-        
-        return parse_test_result(output_file, run_number, execution_time, result.returncode)
-    
-    
-    def _run_mocking_strategy(self, run_number: int) -> Dict:
-        """Execute mocking mitigation strategy"""
-        output_file = self.output_dir / f"mitigation_mocking_run_{run_number:03d}.json"
-        
-        # Create temporary conftest with mocks
-        conftest_content = create_mock_conftest_content()
-        conftest_path = Path("tests/conftest.py")
-        
-        try:
-            with open(conftest_path, 'w') as f:
-                f.write(conftest_content)
-            
-            cmd = [
-                sys.executable, "-m", "pytest",
-                "tests/",
-                "-m", "flaky",
-                "--json-report",
-                f"--json-report-file={output_file}",
-                "-q"
-            ]
-            
-            start_time = time.time()
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            execution_time = time.time() - start_time
-            
-            return parse_test_result(output_file, run_number, execution_time, result.returncode)
-            
-        finally:
-            if conftest_path.exists():
-                conftest_path.unlink()
-    
-    def _run_isolation_strategy(self, run_number: int) -> Dict:
-        """Execute isolation mitigation strategy"""
-        output_file = self.output_dir / f"mitigation_isolation_run_{run_number:03d}.json"
-        
+    def _run_strategy_batch(self, strategy_name: str, extra_args: tuple,
+                            use_mocks: bool) -> List[Dict]:
+        """Execute all runs of a mitigation strategy in one pytest invocation"""
+        runs = self.config.mitigation_runs
+        output_file = f"{self._out_str}/mitigation_{strategy_name}_runs.json"
+
         cmd = [
-            sys.executable, "-m", "pytest",
-            "tests/",
-            "-m", "flaky",
-            "--forked",
-            "--json-report",
+            *_PYTEST_BASE,
+            *_pytest_target("flaky"),
+            *extra_args,
+            "--count", str(runs),
             f"--json-report-file={output_file}",
-            "-q"
         ]
-        
+        if use_mocks:
+            cmd += ("-p", "study_mock_plugin")
+
         start_time = time.time()
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        # Console output is never read (results come from the JSON report),
+        # so route it to DEVNULL rather than buffering it through pipes
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                env=self._base_env)
         execution_time = time.time() - start_time
-        
-        return parse_test_result(output_file, run_number, execution_time, result.returncode)
-    
-    def _run_combined_strategy(self, run_number: int) -> Dict:
-        """Execute combined mitigation strategy"""
-        output_file = self.output_dir / f"mitigation_combined_run_{run_number:03d}.json"
-        
-        # Create temporary conftest with mocks
-        conftest_content = create_mock_conftest_content()
-        conftest_path = Path("tests/conftest.py")
-        
-        try:
-            with open(conftest_path, 'w') as f:
-                f.write(conftest_content)
-            
-            cmd = [
-                sys.executable, "-m", "pytest",
-                "tests/",
-                "-m", "flaky",
-                "--reruns=2",
-                "--reruns-delay=0.5",
-                "--forked",
-                "--json-report",
-                f"--json-report-file={output_file}",
-                "-q"
-            ]
-            
-            start_time = time.time()
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            execution_time = time.time() - start_time
-            
-            return parse_test_result(output_file, run_number, execution_time, result.returncode)
-            
-        finally:
-            if conftest_path.exists():
-                conftest_path.unlink()
+
+        return parse_repeated_test_result(output_file, runs, execution_time, result.returncode)
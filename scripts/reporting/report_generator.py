@@ -5,310 +5,451 @@ Report Generation Module
 Generates comprehensive reports and saves study data.
 """
 
+import io
+import os
+import sys
 import json
 import time
+import functools
 from pathlib import Path
-from datetime import datetime
+from operator import itemgetter
 from typing import Dict
-import pandas as pd
+
+# pandas (for the summary tables) and datetime (one header timestamp) are
+# imported inside the methods that need them: both are dead weight for
+# report-only callers and pandas alone costs seconds of cold import
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
+
+# Shared row templates built once at import; %-formatting interpolates a
+# whole row in a single C call instead of evaluating an f-string per row
+_FLAKY_TMPL = (
+    "%s:\n"
+    "  • Pass Rate: %.1f%% (flakiness index: %.3f)\n"
+    "  • Severity: %s\n"
+    "  • Predictability: %s\n"
+    "  • Mechanism: %s\n\n"
+)
+_MITIGATION_TMPL = (
+    "%s:\n"
+    "  • Pass Rate Improvement: %+.1f%%\n"
+    "  • Performance Overhead: %+.1f%%\n"
+    "  • Effectiveness Score: %.3f\n\n"
+)
+_COST_BENEFIT_TMPL = (
+    "%s:\n"
+    "  • ROI: %.2f\n"
+    "  • Recommendation: %s\n\n"
+)
+_PRIORITY_TMPL = "  %d. %s (ROI: %.2f)\n"
+
+# C-level extractor for the experiment totals; paired with an explicit key
+# check it avoids a Python-level .get(default) per result dict
+_get_runs = itemgetter('total_runs')
+_TYPE_REC_TMPL = (
+    "  • %s: Use %s\n"
+    "    Expected effectiveness: %.1f%%\n"
+    "    Notes: %s\n"
+)
+
+
+@functools.lru_cache(maxsize=64)
+def _pretty(key: str, mode: str = 'title') -> str:
+    """Cached human-readable form of a strategy or flakiness-type key
+
+    The same handful of keys is re-styled many times per report; caching
+    collapses the repeated replace/title/upper allocations to dict hits.
+    """
+    if mode == 'upper':
+        return key.upper().replace('_', ' ')
+    return key.replace('_', ' ').title()
 
 
 class ReportGenerator:
     """Generates comprehensive final reports and saves all data"""
     
-    def __init__(self, study_start_time: float, study_metadata: Dict):
+    def __init__(self, study_start_time: float, study_metadata: Dict,
+                 summary_formats: tuple = ('csv', 'parquet', 'feather'),
+                 pretty_json: bool = False):
         self.study_start_time = study_start_time
         self.study_metadata = study_metadata
+        # Columnar formats load far faster than CSV in analysis notebooks;
+        # they are skipped with a warning if pyarrow is unavailable
+        self.summary_formats = summary_formats
+        # When set, an indented copy of the study data is written alongside
+        # the compact machine-readable dump
+        self.pretty_json = pretty_json
+        # ROI ranking computed lazily on first use and shared by the report,
+        # the console summary and the priority update
+        self._sorted_by_roi = None
+        # Study duration captured once per generate_report call so the text
+        # report, the saved JSON and the console summary agree exactly
+        self._duration_min = None
     
     def generate_report(self, analysis_results: Dict, baseline_results: Dict, 
                        mitigation_results: Dict, output_dir: Path):
         """Generate comprehensive final report"""
         print("📋 PHASE 4: REPORT GENERATION")
         print("=" * 50)
-        
-        # Generate text report
+
+        self._duration_min = (time.time() - self.study_start_time) / 60
+
+
+        # Generate text report once; _save_all_data reuses the rendered string
         report_content = self._generate_text_report(analysis_results, baseline_results, mitigation_results)
-        
+
         # Save all data
-        self._save_all_data(analysis_results, baseline_results, mitigation_results, output_dir)
+        self._save_all_data(analysis_results, baseline_results, mitigation_results,
+                            output_dir, report_content)
         
         # Print final summary
         self._print_final_summary(analysis_results, output_dir)
         
         return report_content
     
-    def _generate_text_report(self, analysis_results: Dict, baseline_results: Dict, 
+    def _generate_text_report(self, analysis_results: Dict, baseline_results: Dict,
                              mitigation_results: Dict) -> str:
         """Generate comprehensive text report"""
-        report_lines = []
-        
+        from datetime import datetime
+
+        # Single growing string buffer instead of a list of transient
+        # f-string elements joined at the end
+        buf = io.StringIO()
+        w = buf.write
+
         # Header
-        report_lines.extend([
-            "=" * 80,
-            "COMPREHENSIVE FLAKY TEST MITIGATION STUDY - FINAL REPORT",
-            "=" * 80,
-            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            f"Study Duration: {(time.time() - self.study_start_time) / 60:.1f} minutes",
-            f"Framework: Synthetic Flaky Python",
-            "",
-            "EXECUTIVE SUMMARY",
-            "-" * 40,
-        ])
-        
+        w("=" * 80 + "\n")
+        w("COMPREHENSIVE FLAKY TEST MITIGATION STUDY - FINAL REPORT\n")
+        w("=" * 80 + "\n")
+        w(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        w(f"Study Duration: {self._duration_min:.1f} minutes\n")
+        w("Framework: Synthetic Flaky Python\n")
+        w("\n")
+        w("EXECUTIVE SUMMARY\n")
+        w("-" * 40 + "\n")
+
         # Executive summary
         if analysis_results.get('cost_benefit_analysis'):
-            best_strategy = max(analysis_results['cost_benefit_analysis'].items(),
-                              key=lambda x: x[1]['roi'])
-            
-            total_experiments = (sum(data.get('total_runs', 0) for data in baseline_results.values()) + 
-                               sum(data.get('total_runs', 0) for data in mitigation_results.values()))
-            
-            report_lines.extend([
-                f"This study analyzed 5 types of flakiness and 4 mitigation strategies.",
-                f"Best overall strategy: {best_strategy[0].upper()} (ROI: {best_strategy[1]['roi']:.2f})",
-                f"Total experiments executed: {total_experiments}",
-                ""
-            ])
-        
-        # Flakiness classification
-        if analysis_results.get('flakiness_classification'):
-            report_lines.extend([
-                "FLAKINESS CLASSIFICATION ANALYSIS",
-                "-" * 40,
-            ])
-            
-            for flaky_type, data in analysis_results['flakiness_classification'].items():
-                metrics = data['observed_metrics']
-                classification = data['classification']
-                
-                report_lines.extend([
-                    f"{flaky_type.upper().replace('_', ' ')}:",
-                    f"  • Pass Rate: {metrics['avg_pass_rate']:.1%} (flakiness index: {metrics['flakiness_index']:.3f})",
-                    f"  • Severity: {classification['severity'].replace('_', ' ').title()}",
-                    f"  • Predictability: {classification['predictability'].replace('_', ' ').title()}",
-                    f"  • Mechanism: {data['profile']['failure_mechanism']}",
-                    ""
-                ])
-        
-        # Mitigation effectiveness
-        if analysis_results.get('mitigation_effectiveness'):
-            report_lines.extend([
-                "MITIGATION STRATEGY EFFECTIVENESS",
-                "-" * 40,
-            ])
-            
-            for strategy, data in analysis_results['mitigation_effectiveness'].items():
-                improvement = data['pass_rate_improvement']['relative_percent']
-                overhead = data['performance_impact']['time_overhead_percent']
-                score = data['effectiveness_score']
-                
-                report_lines.extend([
-                    f"{strategy.upper()}:",
-                    f"  • Pass Rate Improvement: {improvement:+.1f}%",
-                    f"  • Performance Overhead: {overhead:+.1f}%",
-                    f"  • Effectiveness Score: {score:.3f}",
-                    ""
-                ])
-        
-        # Cost-benefit analysis
-        if analysis_results.get('cost_benefit_analysis'):
-            report_lines.extend([
-                "COST-BENEFIT ANALYSIS",
-                "-" * 40,
-            ])
-            
-            for strategy, data in analysis_results['cost_benefit_analysis'].items():
-                roi = data['roi']
-                recommendation = data['recommendation']
-                
-                report_lines.extend([
-                    f"{strategy.upper()}:",
-                    f"  • ROI: {roi:.2f}",
-                    f"  • Recommendation: {recommendation}",
-                    ""
-                ])
-        
-        # Recommendations
-        if analysis_results.get('recommendations'):
-            recommendations = analysis_results['recommendations']
-            
-            report_lines.extend([
-                "PRACTICAL RECOMMENDATIONS",
-                "-" * 40,
-            ])
-            
-            # Implementation priorities
-            if recommendations.get('implementation_priorities'):
-                report_lines.append("Implementation Priority Ranking:")
-                for priority in recommendations['implementation_priorities']:
-                    report_lines.append(f"  {priority['priority']}. {priority['strategy'].upper()} (ROI: {priority['roi']:.2f})")
-                report_lines.append("")
-            
-            # By flakiness type
-            if recommendations.get('by_flakiness_type'):
-                report_lines.append("Recommendations by Flakiness Type:")
-                for flaky_type, rec in recommendations['by_flakiness_type'].items():
-                    report_lines.extend([
-                        f"  • {flaky_type.replace('_', ' ').title()}: Use {rec['primary_recommendation'].upper()}",
-                        f"    Expected effectiveness: {rec['effectiveness_expected']:.1%}",
-                        f"    Notes: {rec['implementation_notes']}",
-                    ])
-                report_lines.append("")
-            
-            # General guidelines
-            if recommendations.get('general_guidelines'):
-                report_lines.append("General Guidelines:")
-                for guideline in recommendations['general_guidelines']:
-                    report_lines.append(f"  • {guideline}")
-                report_lines.append("")
-        
+            best_strategy = self._roi_ranking(analysis_results)[0]
+
+            total_experiments = (sum(_get_runs(data) for data in baseline_results.values() if 'total_runs' in data) +
+                                 sum(_get_runs(data) for data in mitigation_results.values() if 'total_runs' in data))
+
+            w("This study analyzed 5 types of flakiness and 4 mitigation strategies.\n")
+            w(f"Best overall strategy: {_pretty(best_strategy[0], 'upper')} (ROI: {best_strategy[1]['roi']:.2f})\n")
+            w(f"Total experiments executed: {total_experiments}\n")
+            w("\n")
+
+        # Keyed analysis sections are rendered through the dispatch table so
+        # each section stays a small focused function
+        for key, render in self._SECTIONS:
+            data = analysis_results.get(key)
+            if data:
+                render(self, w, data)
+
         # Technical appendix
-        report_lines.extend([
-            "TECHNICAL APPENDIX",
-            "-" * 40,
-            f"Study Configuration:",
-            f"  • Framework: {self.study_metadata.get('framework', 'synthetic_flaky_python')}",
-            f"  • Study Type: {self.study_metadata.get('study_type', 'comprehensive_analysis')}",
-            f"  • Timestamp: {self.study_metadata.get('timestamp', 'unknown')}",
-            "",
-            "Files Generated:",
-            "  • comprehensive_study_report.txt - This report",
-            "  • comprehensive_study_data.json - Complete raw data",
-            "  • flakiness_classification.png - Flakiness analysis visualization",
-            "  • mitigation_effectiveness.png - Strategy effectiveness comparison",
-            "  • cost_benefit_analysis.png - Cost-benefit visualization",
-            "  • performance_analysis.png - Performance metrics",
-            "",
-            "=" * 80,
-        ])
-        
-        report_content = "\n".join(report_lines)
-        return report_content
-    
-    def _save_all_data(self, analysis_results: Dict, baseline_results: Dict, 
-                      mitigation_results: Dict, output_dir: Path):
+        w("TECHNICAL APPENDIX\n")
+        w("-" * 40 + "\n")
+        w("Study Configuration:\n")
+        w(f"  • Framework: {self.study_metadata.get('framework', 'synthetic_flaky_python')}\n")
+        w(f"  • Study Type: {self.study_metadata.get('study_type', 'comprehensive_analysis')}\n")
+        w(f"  • Timestamp: {self.study_metadata.get('timestamp', 'unknown')}\n")
+        w("\n")
+        w("Files Generated:\n")
+        w("  • comprehensive_study_report.txt - This report\n")
+        w("  • comprehensive_study_data.json - Complete raw data\n")
+        w("  • flakiness_classification.png - Flakiness analysis visualization\n")
+        w("  • mitigation_effectiveness.png - Strategy effectiveness comparison\n")
+        w("  • cost_benefit_analysis.png - Cost-benefit visualization\n")
+        w("  • performance_analysis.png - Performance metrics\n")
+        w("\n")
+        w("=" * 80)
+
+        return buf.getvalue()
+
+    def _render_flakiness(self, w, classification):
+        """Render the flakiness classification section"""
+        w("FLAKINESS CLASSIFICATION ANALYSIS\n")
+        w("-" * 40 + "\n")
+
+        # One write per entry keeps the loop body a single buffer append
+        # instead of six dispatches through the write method
+        for flaky_type, data in classification.items():
+            metrics = data['observed_metrics']
+            labels = data['classification']
+
+            w(_FLAKY_TMPL % (
+                _pretty(flaky_type, 'upper'),
+                metrics['avg_pass_rate'] * 100,
+                metrics['flakiness_index'],
+                _pretty(labels['severity']),
+                _pretty(labels['predictability']),
+                data['profile']['failure_mechanism']))
+
+    def _render_mitigation(self, w, effectiveness):
+        """Render the mitigation effectiveness section"""
+        w("MITIGATION STRATEGY EFFECTIVENESS\n")
+        w("-" * 40 + "\n")
+
+        for strategy, data in effectiveness.items():
+            w(_MITIGATION_TMPL % (
+                _pretty(strategy, 'upper'),
+                data['pass_rate_improvement']['relative_percent'],
+                data['performance_impact']['time_overhead_percent'],
+                data['effectiveness_score']))
+
+    def _render_cost_benefit(self, w, cost_benefit):
+        """Render the cost-benefit section"""
+        w("COST-BENEFIT ANALYSIS\n")
+        w("-" * 40 + "\n")
+
+        for strategy, data in cost_benefit.items():
+            w(_COST_BENEFIT_TMPL % (_pretty(strategy, 'upper'), data['roi'], data['recommendation']))
+
+    def _render_recommendations(self, w, recommendations):
+        """Render the practical recommendations section"""
+        w("PRACTICAL RECOMMENDATIONS\n")
+        w("-" * 40 + "\n")
+
+        # Implementation priorities
+        if recommendations.get('implementation_priorities'):
+            w("Implementation Priority Ranking:\n")
+            for priority in recommendations['implementation_priorities']:
+                w(_PRIORITY_TMPL % (priority['priority'], _pretty(priority['strategy'], 'upper'), priority['roi']))
+            w("\n")
+
+        # By flakiness type
+        if recommendations.get('by_flakiness_type'):
+            w("Recommendations by Flakiness Type:\n")
+            for flaky_type, rec in recommendations['by_flakiness_type'].items():
+                w(_TYPE_REC_TMPL % (
+                    _pretty(flaky_type),
+                    _pretty(rec['primary_recommendation'], 'upper'),
+                    rec['effectiveness_expected'] * 100,
+                    rec['implementation_notes']))
+            w("\n")
+
+        # General guidelines
+        if recommendations.get('general_guidelines'):
+            w("General Guidelines:\n")
+            for guideline in recommendations['general_guidelines']:
+                w(f"  • {guideline}\n")
+            w("\n")
+
+    # Section dispatch table: analysis-result key -> renderer, in report
+    # order; each renderer takes the buffer's write callable and the data
+    _SECTIONS = (
+        ('flakiness_classification', _render_flakiness),
+        ('mitigation_effectiveness', _render_mitigation),
+        ('cost_benefit_analysis', _render_cost_benefit),
+        ('recommendations', _render_recommendations),
+    )
+
+    def _save_all_data(self, analysis_results: Dict, baseline_results: Dict,
+                      mitigation_results: Dict, output_dir: Path, report_content: str = None):
         """Save all experimental data and analysis results"""
         print("💾 Saving all data...")
-        
-        complete_data = {
-            'study_metadata': self.study_metadata,
-            'baseline_results': baseline_results,
-            'mitigation_results': mitigation_results,
-            'analysis_results': analysis_results,
-            'study_duration_minutes': (time.time() - self.study_start_time) / 60
-        }
-        
-        # Save complete data as JSON
-        data_file = output_dir / "comprehensive_study_data.json"
-        with open(data_file, 'w') as f:
-            json.dump(complete_data, f, indent=2, default=str)
-        
+
+        sections = (
+            ('study_metadata', self.study_metadata),
+            ('baseline_results', baseline_results),
+            ('mitigation_results', mitigation_results),
+            ('analysis_results', analysis_results),
+            ('study_duration_minutes', self._duration_min),
+        )
+
+        # Save complete data as JSON; orjson encodes the large nested dict
+        # several times faster than stdlib json and handles numpy scalars
+        # natively instead of bouncing through default=str
+        # A 1 MiB write buffer keeps the multi-MB dump from degrading into
+        # thousands of 8 KiB default-buffer syscalls
+        # The data file is meant for machine consumption, so it is written
+        # compact: roughly half the bytes of indent=2 and faster to encode
+        # and reload; an indented copy is opt-in via pretty_json
+        self._dump_sections(output_dir / "comprehensive_study_data.json", sections)
+        if self.pretty_json:
+            self._dump_sections(output_dir / "comprehensive_study_data.pretty.json",
+                                sections, pretty=True)
+
         # Save CSV summaries for easy analysis
         self._save_csv_summaries(baseline_results, mitigation_results, output_dir)
-        
-        # Save text report
-        report_content = self._generate_text_report(analysis_results, baseline_results, mitigation_results)
-        report_file = output_dir / "comprehensive_study_report.txt"
-        with open(report_file, 'w') as f:
-            f.write(report_content)
+
+        # Save text report; reuse the caller's rendered content rather than
+        # rebuilding the identical report a second time, and let write_text
+        # hand the whole string to the OS in one call
+        if report_content is None:
+            report_content = self._generate_text_report(analysis_results, baseline_results, mitigation_results)
+        (output_dir / "comprehensive_study_report.txt").write_text(report_content, encoding='utf-8')
+
+    def _dump_sections(self, data_file: Path, sections: tuple, pretty: bool = False):
+        """Encode the top-level (key, value) sections to one JSON file
+
+        Writes to a sibling temp file and os.replace()s it into place so a
+        crash mid-dump never leaves a truncated data file behind.
+        """
+        tmp_file = data_file.with_suffix('.json.tmp')
+        if orjson is not None:
+            # Encode one top-level section at a time so peak memory is
+            # bounded by the largest sub-tree instead of the whole document
+            opts = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            if pretty:
+                opts |= orjson.OPT_INDENT_2
+            with open(tmp_file, 'wb', buffering=1 << 20) as f:
+                f.write(b'{')
+                for i, (key, value) in enumerate(sections):
+                    if i:
+                        f.write(b',')
+                    f.write(orjson.dumps(key))
+                    f.write(b':')
+                    f.write(orjson.dumps(value, option=opts, default=str))
+                f.write(b'}')
+        else:
+            with open(tmp_file, 'w', buffering=1 << 20) as f:
+                json.dump(dict(sections), f, indent=2 if pretty else None, default=str)
+        os.replace(tmp_file, data_file)
     
     def _save_csv_summaries(self, baseline_results: Dict, mitigation_results: Dict, output_dir: Path):
         """Save CSV summaries for easy analysis"""
+        import pandas as pd
+
+        # Columnar construction (one list per column) lets pandas allocate
+        # typed arrays directly instead of inferring dtypes row by row
         # Baseline summary
         if baseline_results:
-            baseline_summary = []
+            cols = {'test_type': [], 'avg_pass_rate': [], 'std_pass_rate': [],
+                    'flakiness_index': [], 'total_runs': [], 'valid_runs': [],
+                    'duration': []}
             for test_type, data in baseline_results.items():
-                baseline_summary.append({
-                    'test_type': test_type,
-                    'avg_pass_rate': data.get('avg_pass_rate', 0),
-                    'std_pass_rate': data.get('std_pass_rate', 0),
-                    'flakiness_index': data.get('flakiness_index', 0),
-                    'total_runs': data.get('total_runs', 0),
-                    'valid_runs': data.get('valid_runs', 0),
-                    'duration': data.get('duration', 0)
-                })
-            
-            pd.DataFrame(baseline_summary).to_csv(
-                output_dir / 'baseline_summary.csv', index=False)
-        
+                cols['test_type'].append(test_type)
+                cols['avg_pass_rate'].append(data.get('avg_pass_rate', 0))
+                cols['std_pass_rate'].append(data.get('std_pass_rate', 0))
+                cols['flakiness_index'].append(data.get('flakiness_index', 0))
+                cols['total_runs'].append(data.get('total_runs', 0))
+                cols['valid_runs'].append(data.get('valid_runs', 0))
+                cols['duration'].append(data.get('duration', 0))
+
+            self._write_summary(pd.DataFrame(cols), output_dir, 'baseline_summary')
+
         # Mitigation summary
         if mitigation_results:
-            mitigation_summary = []
+            cols = {'strategy': [], 'avg_pass_rate': [], 'std_pass_rate': [],
+                    'avg_execution_time': [], 'total_runs': [], 'valid_runs': [],
+                    'duration': []}
             for strategy, data in mitigation_results.items():
-                mitigation_summary.append({
-                    'strategy': strategy,
-                    'avg_pass_rate': data.get('avg_pass_rate', 0),
-                    'std_pass_rate': data.get('std_pass_rate', 0),
-                    'avg_execution_time': data.get('avg_execution_time', 0),
-                    'total_runs': data.get('total_runs', 0),
-                    'valid_runs': data.get('valid_runs', 0),
-                    'duration': data.get('duration', 0)
-                })
-            
-            pd.DataFrame(mitigation_summary).to_csv(
-                output_dir / 'mitigation_summary.csv', index=False)
+                cols['strategy'].append(strategy)
+                cols['avg_pass_rate'].append(data.get('avg_pass_rate', 0))
+                cols['std_pass_rate'].append(data.get('std_pass_rate', 0))
+                cols['avg_execution_time'].append(data.get('avg_execution_time', 0))
+                cols['total_runs'].append(data.get('total_runs', 0))
+                cols['valid_runs'].append(data.get('valid_runs', 0))
+                cols['duration'].append(data.get('duration', 0))
+
+            self._write_summary(pd.DataFrame(cols), output_dir, 'mitigation_summary')
+
+    def _write_summary(self, df, output_dir: Path, stem: str):
+        """Write a summary table in each configured format"""
+        if 'csv' in self.summary_formats:
+            df.to_csv(output_dir / f'{stem}.csv', index=False)
+
+        try:
+            if 'parquet' in self.summary_formats:
+                df.to_parquet(output_dir / f'{stem}.parquet', compression='zstd')
+            if 'feather' in self.summary_formats:
+                df.to_feather(output_dir / f'{stem}.feather')
+        except ImportError as e:
+            print(f"Warning: Skipping columnar summary formats ({e})")
     
     def _print_final_summary(self, analysis_results: Dict, output_dir: Path):
         """Print final summary to console"""
-        total_duration = (time.time() - self.study_start_time) / 60
-        
-        print("\n" + "=" * 70)
-        print("🎉 COMPREHENSIVE STUDY COMPLETED!")
-        print("=" * 70)
-        print(f"📊 Study Duration: {total_duration:.1f} minutes")
-        print(f"📁 Results Directory: {output_dir}")
-        print()
-        
+        total_duration = self._duration_min
+
+        # Collect the whole summary first and emit it through one stdout
+        # write/flush instead of a separate write per print() call
+        lines = [
+            "",
+            "=" * 70,
+            "🎉 COMPREHENSIVE STUDY COMPLETED!",
+            "=" * 70,
+            f"📊 Study Duration: {total_duration:.1f} minutes",
+            f"📁 Results Directory: {output_dir}",
+            "",
+        ]
+
         # Key findings summary
         if analysis_results.get('cost_benefit_analysis'):
             # Best strategy by ROI
-            best_roi = max(analysis_results['cost_benefit_analysis'].items(),
-                          key=lambda x: x[1]['roi'])
-            
-            # Most effective strategy
+            best_roi = self._roi_ranking(analysis_results)[0]
+
+            # Most effective strategy; extract the score first so max()
+            # compares with a C-level itemgetter key
             if analysis_results.get('mitigation_effectiveness'):
-                best_effectiveness = max(analysis_results['mitigation_effectiveness'].items(),
-                                       key=lambda x: x[1]['effectiveness_score'])
-                
-                print("🏆 KEY FINDINGS:")
-                print(f"   Best ROI: {best_roi[0].upper()} (ROI: {best_roi[1]['roi']:.2f})")
-                print(f"   Most Effective: {best_effectiveness[0].upper()} (Score: {best_effectiveness[1]['effectiveness_score']:.3f})")
-        
+                best_score, best_strategy = max(
+                    ((data['effectiveness_score'], strategy)
+                     for strategy, data in analysis_results['mitigation_effectiveness'].items()),
+                    key=itemgetter(0))
+
+                lines.append("🏆 KEY FINDINGS:")
+                lines.append(f"   Best ROI: {_pretty(best_roi[0], 'upper')} (ROI: {best_roi[1]['roi']:.2f})")
+                lines.append(f"   Most Effective: {_pretty(best_strategy, 'upper')} (Score: {best_score:.3f})")
+
         # Flakiness insights
         if analysis_results.get('flakiness_classification'):
-            most_problematic = min(analysis_results['flakiness_classification'].items(),
-                                 key=lambda x: x[1]['observed_metrics']['avg_pass_rate'])
-            
-            print(f"   Most Problematic Type: {most_problematic[0].replace('_', ' ').title()} ({most_problematic[1]['observed_metrics']['avg_pass_rate']:.1%} pass rate)")
-        
-        print()
-        print("📋 Generated Files:")
-        print(f"   📄 comprehensive_study_report.txt - Complete analysis report")
-        print(f"   📊 comprehensive_study_data.json - All raw data and results")
-        print(f"   📈 *.png - Visualization charts (4 files)")
-        print(f"   📝 *.csv - Summary tables (2 files)")
-        print()
-        print("✅ Study complete!")
+            worst_rate, worst_type = min(
+                ((data['observed_metrics']['avg_pass_rate'], flaky_type)
+                 for flaky_type, data in analysis_results['flakiness_classification'].items()),
+                key=itemgetter(0))
+
+            lines.append(f"   Most Problematic Type: {_pretty(worst_type)} ({worst_rate:.1%} pass rate)")
+
+        lines += [
+            "",
+            "📋 Generated Files:",
+            "   📄 comprehensive_study_report.txt - Complete analysis report",
+            "   📊 comprehensive_study_data.json - All raw data and results",
+            "   📈 *.png - Visualization charts (4 files)",
+            "   📝 *.csv - Summary tables (2 files)",
+            "",
+            "✅ Study complete!",
+        ]
+
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
     
+    def _roi_ranking(self, analysis_results: Dict) -> list:
+        """Cost-benefit entries sorted by ROI, computed once per study"""
+        if self._sorted_by_roi is None:
+            # Decorate with the roi up front so the sort compares via the
+            # C-level itemgetter instead of a Python lambda per element
+            decorated = [(data['roi'], strategy, data)
+                         for strategy, data in analysis_results['cost_benefit_analysis'].items()]
+            decorated.sort(key=itemgetter(0), reverse=True)
+            self._sorted_by_roi = [(strategy, data) for _, strategy, data in decorated]
+        return self._sorted_by_roi
+
     def update_implementation_priorities(self, analysis_results: Dict):
         """Update implementation priorities based on cost-benefit analysis"""
         if not analysis_results.get('cost_benefit_analysis'):
             return
-        
-        cost_benefit = analysis_results['cost_benefit_analysis']
-        sorted_strategies = sorted(cost_benefit.items(), 
-                                 key=lambda x: x[1]['roi'], reverse=True)
-        
-        priorities = [
-            {
-                'priority': i + 1,
+
+        sorted_strategies = self._roi_ranking(analysis_results)
+
+        # Bind append to a local so the loop body skips the method lookup
+        # on every iteration
+        priorities = []
+        append = priorities.append
+        for i, (strategy, data) in enumerate(sorted_strategies, 1):
+            append({
+                'priority': i,
                 'strategy': strategy,
                 'roi': data['roi'],
                 'justification': data['recommendation']
-            }
-            for i, (strategy, data) in enumerate(sorted_strategies)
-        ]
-        
+            })
+
+
         if 'recommendations' not in analysis_results:
             analysis_results['recommendations'] = {}
         
@@ -16,6 +16,7 @@ Study Components:
 import sys
 import time
 import argparse
+from dataclasses import asdict
 from pathlib import Path
 from datetime import datetime
 
@@ -48,11 +49,12 @@ class ComprehensiveStudy:
             "study_type": "comprehensive_flaky_test_analysis",
             "framework": "synthetic_flaky_python",
             "timestamp": datetime.now().isoformat(),
-            "configuration": config.__dict__
+            "configuration": asdict(config)
         }
         
         # Initialize report generator
-        self.report_generator = ReportGenerator(self.study_start_time, self.study_metadata)
+        self.report_generator = ReportGenerator(self.study_start_time, self.study_metadata,
+                                                pretty_json=config.pretty_json)
         
         # Results storage
         self.baseline_results = {}
@@ -120,7 +122,7 @@ class ComprehensiveStudy:
     
     def _print_configuration(self):
         """Print study configuration"""
-        print(f"Configuration:")
+        print("Configuration:")
         print(f"  • Baseline runs per type: {self.config.baseline_runs}")
         print(f"  • Mitigation runs per strategy: {self.config.mitigation_runs}")
         print(f"  • Seeds: {self.config.seeds}")
@@ -147,6 +149,8 @@ def setup_args():
                        help="Skip baseline experiments (use existing data)")
     parser.add_argument("--skip-mitigation", action="store_true",
                        help="Skip mitigation experiments (use existing data)")
+    parser.add_argument("--pretty-json", action="store_true",
+                       help="Also write an indented copy of the study data JSON")
     
     return parser.parse_args()
 
@@ -160,11 +164,12 @@ def main():
     config = StudyConfiguration(
         baseline_runs=args.baseline_runs,
         mitigation_runs=args.mitigation_runs,
-        seeds=args.seeds,
+        seeds=tuple(args.seeds),
         output_dir=args.output_dir,
         verbose=args.verbose,
         skip_baseline=args.skip_baseline,
-        skip_mitigation=args.skip_mitigation
+        skip_mitigation=args.skip_mitigation,
+        pretty_json=args.pretty_json
     )
     
     # Initialize and run study
@@ -0,0 +1,90 @@
+"""
+Run Cache Module
+================
+
+Persistent disk cache of baseline run results keyed by content hash, so
+repeated development runs skip pytest invocations whose inputs are unchanged.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from importlib import metadata
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
+from config.study_config import FLAKINESS_TYPES, MITIGATION_STRATEGIES
+
+
+def _pytest_version() -> str:
+    try:
+        return metadata.version('pytest')
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+# Schema marker folded into every key: changing the marker/strategy tables
+# or the pytest version silently invalidates all existing entries
+_SCHEMA_VERSION = '|'.join([
+    '1',
+    ','.join(FLAKINESS_TYPES),
+    ','.join(MITIGATION_STRATEGIES),
+    _pytest_version(),
+])
+
+
+class RunCache:
+    """Content-addressed cache of run results under {output_dir}/.cache"""
+
+    def __init__(self, output_dir, tests_dir: str = "tests"):
+        self.cache_dir = Path(output_dir) / ".cache"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._tests_fingerprint = self._fingerprint_tests(Path(tests_dir))
+
+    @staticmethod
+    def _fingerprint_tests(tests_dir: Path) -> str:
+        """Hash the test tree's paths, sizes and mtimes as a change detector"""
+        digest = hashlib.sha256()
+        if tests_dir.is_dir():
+            for path in sorted(tests_dir.rglob('*.py')):
+                stat = path.stat()
+                digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        return digest.hexdigest()
+
+    def key(self, *parts) -> str:
+        """Build a cache key from the schema, tests fingerprint and run parts"""
+        payload = '|'.join([_SCHEMA_VERSION, self._tests_fingerprint, *map(str, parts)])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str):
+        """Return the cached value for key, or None on miss or corruption"""
+        path = self.cache_dir / f"{key}.json"
+        try:
+            raw = path.read_bytes()
+        except OSError:
+            return None
+
+        try:
+            return orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except Exception:
+            return None
+
+    def put(self, key: str, value) -> None:
+        """Store value under key atomically (tmp file + os.replace)"""
+        path = self.cache_dir / f"{key}.json"
+        data = orjson.dumps(value) if orjson is not None else json.dumps(value).encode()
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Warning: Failed to write run cache entry: {e}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
@@ -5,14 +5,19 @@ Chart Generation Module
 Creates comprehensive visualizations for the flaky test study results.
 """
 
+from collections import Counter
 from pathlib import Path
 from typing import Dict
+import matplotlib
+# Charts only ever go to PNG files; pin the Agg backend before pyplot
+# loads so no GUI toolkit is probed or initialized
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
-import pandas as pd
 import numpy as np
 
 from classification.flakiness_classifier import FlakynessClassifier
+from utils.helpers import load_results_jsonl
 
 
 class ChartGenerator:
@@ -62,7 +67,12 @@ class ChartGenerator:
             pass_rates.append(data['observed_metrics']['avg_pass_rate'])
             flakiness_indices.append(data['observed_metrics']['flakiness_index'])
             severities.append(data['classification']['severity'])
-        
+
+        # Hand the numeric series to matplotlib as arrays so it skips its
+        # own per-call list conversion
+        pass_rates = np.asarray(pass_rates)
+        flakiness_indices = np.asarray(flakiness_indices)
+
         # Pass rates by type
         bars1 = axes[0,0].bar(types, pass_rates, color='skyblue', alpha=0.7)
         axes[0,0].set_title('Average Pass Rate by Flakiness Type')
@@ -81,14 +91,20 @@ class ChartGenerator:
         axes[0,1].set_ylabel('Flakiness Index')
         axes[0,1].tick_params(axis='x', rotation=45)
         
-        # Severity distribution
-        severity_counts = pd.Series(severities).value_counts()
-        axes[1,0].pie(severity_counts.values, labels=severity_counts.index, autopct='%1.1f%%')
+        # Severity distribution; Counter is all that is needed to tally a
+        # handful of label strings
+        severity_counts = Counter(severities)
+        axes[1,0].pie(list(severity_counts.values()), labels=list(severity_counts.keys()),
+                      autopct='%1.1f%%')
         axes[1,0].set_title('Severity Distribution')
         
-        # Expected vs Observed Pass Rates
-        expected_rates = [self.flakiness_profiles[flaky_type].typical_pass_rate for flaky_type in flakiness_data.keys()]
-        
+        # Expected vs Observed Pass Rates; the profile lookups land straight
+        # in a float64 array (every key is present, so the count hint holds)
+        expected_rates = np.fromiter(
+            (self.flakiness_profiles[flaky_type].typical_pass_rate
+             for flaky_type in flakiness_data),
+            dtype=np.float64, count=len(flakiness_data))
+
         x = np.arange(len(types))
         width = 0.35
         
@@ -113,10 +129,15 @@ class ChartGenerator:
         fig, axes = plt.subplots(2, 2, figsize=(15, 10))
         fig.suptitle('Mitigation Strategy Effectiveness Analysis', fontsize=16, fontweight='bold')
         
+        # Fill all parallel lists in one traversal of the effectiveness dict
         strategies = list(effectiveness_data.keys())
-        improvements = [data['pass_rate_improvement']['relative_percent'] for data in effectiveness_data.values()]
-        overheads = [data['performance_impact']['time_overhead_percent'] for data in effectiveness_data.values()]
-        effectiveness_scores = [data['effectiveness_score'] for data in effectiveness_data.values()]
+        improvements = []
+        overheads = []
+        effectiveness_scores = []
+        for data in effectiveness_data.values():
+            improvements.append(data['pass_rate_improvement']['relative_percent'])
+            overheads.append(data['performance_impact']['time_overhead_percent'])
+            effectiveness_scores.append(data['effectiveness_score'])
         
         # Improvement comparison
         bars1 = axes[0,0].bar(strategies, improvements, color='lightgreen', alpha=0.7)
@@ -165,22 +186,33 @@ class ChartGenerator:
         fig, axes = plt.subplots(2, 2, figsize=(15, 10))
         fig.suptitle('Cost-Benefit Analysis', fontsize=16, fontweight='bold')
         
+        # One pass over the dict fills every parallel list, including the
+        # cost breakdown, instead of six separate comprehensions
         strategies = list(cost_benefit_data.keys())
-        total_costs = [data['costs']['total'] for data in cost_benefit_data.values()]
-        benefits = [data['benefits']['improvement_score'] for data in cost_benefit_data.values()]
-        rois = [data['roi'] for data in cost_benefit_data.values()]
-        
-        # Cost breakdown
-        impl_costs = [data['costs']['implementation'] for data in cost_benefit_data.values()]
-        maint_costs = [data['costs']['maintenance'] for data in cost_benefit_data.values()]
-        perf_costs = [data['costs']['performance_overhead'] for data in cost_benefit_data.values()]
+        total_costs, benefits, rois = [], [], []
+        impl_costs, maint_costs, perf_costs = [], [], []
+        for data in cost_benefit_data.values():
+            costs = data['costs']
+            total_costs.append(costs['total'])
+            impl_costs.append(costs['implementation'])
+            maint_costs.append(costs['maintenance'])
+            perf_costs.append(costs['performance_overhead'])
+            benefits.append(data['benefits']['improvement_score'])
+            rois.append(data['roi'])
         
         x = np.arange(len(strategies))
         width = 0.6
-        
-        axes[0,0].bar(x, impl_costs, width, label='Implementation', color='lightblue')
-        axes[0,0].bar(x, maint_costs, width, bottom=impl_costs, label='Maintenance', color='lightcoral')
-        axes[0,0].bar(x, perf_costs, width, bottom=np.array(impl_costs) + np.array(maint_costs), 
+
+        # Convert the cost vectors once; the stacked-bar bottom is then a
+        # single add on contiguous arrays and matplotlib skips its own
+        # list-to-array conversion
+        impl = np.asarray(impl_costs)
+        maint = np.asarray(maint_costs)
+        perf = np.asarray(perf_costs)
+
+        axes[0,0].bar(x, impl, width, label='Implementation', color='lightblue')
+        axes[0,0].bar(x, maint, width, bottom=impl, label='Maintenance', color='lightcoral')
+        axes[0,0].bar(x, perf, width, bottom=impl + maint,
                      label='Performance', color='lightyellow')
         
         axes[0,0].set_title('Cost Breakdown by Strategy')
@@ -243,12 +275,16 @@ class ChartGenerator:
                 baseline_types.append(test_type.replace('_', ' ').title())
                 baseline_pass_rates.append(data['avg_pass_rate'])
                 
-                # Calculate median execution time (more robust to outliers)
-                results = data.get('results', [])
-                exec_times = [r.get('execution_time', 0) for r in results if 'execution_time' in r]
+                # Calculate median execution time (more robust to outliers);
+                # materialize straight into a float64 array so the filter and
+                # median run on contiguous memory
+                results = data.get('results') or load_results_jsonl(data.get('results_file'))
+                exec_times = np.fromiter(
+                    (r['execution_time'] for r in results if 'execution_time' in r),
+                    dtype=np.float64)
                 # Filter outliers using IQR method
                 filtered_times = self._filter_outliers(exec_times)
-                baseline_exec_times.append(np.median(filtered_times) if filtered_times else 0)
+                baseline_exec_times.append(np.median(filtered_times) if filtered_times.size else 0)
         
         # Baseline pass rates
         axes[0,0].bar(baseline_types, baseline_pass_rates, color='lightcoral', alpha=0.7)
@@ -275,9 +311,13 @@ class ChartGenerator:
                 mit_strategies.insert(0, 'baseline')
                 mit_pass_rates.insert(0, baseline_flaky['avg_pass_rate'])
                 # Use median and filter outliers for fair comparison
-                baseline_times = [r.get('execution_time', 0) for r in baseline_flaky.get('results', [])]
+                baseline_flaky_results = (baseline_flaky.get('results')
+                                          or load_results_jsonl(baseline_flaky.get('results_file')))
+                baseline_times = np.fromiter(
+                    (r.get('execution_time', 0) for r in baseline_flaky_results),
+                    dtype=np.float64, count=len(baseline_flaky_results))
                 filtered_baseline_times = self._filter_outliers(baseline_times)
-                baseline_exec_time = np.median(filtered_baseline_times) if filtered_baseline_times else 0
+                baseline_exec_time = np.median(filtered_baseline_times) if filtered_baseline_times.size else 0
                 mit_exec_times.insert(0, baseline_exec_time)
             
             # Pass rate comparison
@@ -303,13 +343,16 @@ class ChartGenerator:
         plt.savefig(output_dir / 'performance_analysis.png', dpi=300, bbox_inches='tight')
         plt.close()
     
-    def _filter_outliers(self, data: list, method='iqr') -> list:
-        """Filter outliers using IQR method or Z-score method"""
-        if not data or len(data) < 3:
-            return data
-        
-        data_array = np.array(data)
-        
+    def _filter_outliers(self, data, method='iqr') -> np.ndarray:
+        """Filter outliers using IQR method or Z-score method
+
+        Accepts a list or ndarray and always returns an ndarray, so callers
+        can chain NumPy reductions without a list round-trip.
+        """
+        data_array = np.asarray(data, dtype=np.float64)
+        if data_array.size < 3:
+            return data_array
+
         if method == 'iqr':
             # Interquartile Range method
             Q1 = np.percentile(data_array, 25)
@@ -329,16 +372,16 @@ class ChartGenerator:
             std = np.std(data_array)
             
             if std == 0:
-                return data
-            
+                return data_array
+
             z_scores = np.abs((data_array - mean) / std)
             filtered_data = data_array[z_scores < 2]  # Remove data points with |z-score| > 2
         
         else:
-            return data
-        
+            return data_array
+
         # Return at least 50% of original data to avoid over-filtering
-        if len(filtered_data) < len(data) * 0.5:
-            return data
-        
-        return filtered_data.tolist()
+        if filtered_data.size < data_array.size * 0.5:
+            return data_array
+
+        return filtered_data
@@ -0,0 +1,24 @@
+"""
+Shared test configuration
+Seeds each pytest process from the STUDY_SEED environment variable
+"""
+import os
+import random
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def seed_from_environment():
+    """Seed RNGs once per process from the seed the study runner passes in
+
+    Session scope keeps the random state evolving across tests and repeat
+    iterations, so flaky behavior is preserved while the process as a whole
+    stays reproducible for a given seed.
+    """
+    study_seed = os.environ.get("STUDY_SEED")
+    if study_seed is not None:
+        random.seed(int(study_seed))
+        np.random.seed(int(study_seed))
+    yield